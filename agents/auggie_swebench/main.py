@@ -1,10 +1,168 @@
+import atexit
+import fcntl
 import json
 import os
+import shlex
 import shutil
 import subprocess
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any
 
+# Persistent per-repo bare mirrors. SWE-bench runs hit the same repos
+# (django, sympy, ...) over and over; fetching into a shared cache avoids
+# re-downloading pack data for every instance.
+_REPO_CACHE_DIR = os.path.join(
+    os.environ.get("XDG_CACHE_HOME", os.path.expanduser("~/.cache")), "hal", "auggie"
+)
+
+# Built once at import rather than os.environ.copy() per instance. Beyond
+# non-interactivity: GIT_OPTIONAL_LOCKS skips index.lock for read-only ops,
+# and pointing the global/system config at /dev/null saves git a stat of the
+# user's gitconfig on every one of the several invocations per instance
+# (identity is set per-workspace, so nothing from the user config is needed).
+_GIT_ENV = {
+    **os.environ,
+    "GIT_TERMINAL_PROMPT": "0",
+    "GIT_OPTIONAL_LOCKS": "0",
+    "GIT_CONFIG_GLOBAL": "/dev/null",
+    "GIT_CONFIG_SYSTEM": "/dev/null",
+}
+
+
+class GitBatch:
+    """Long-lived `git cat-file --batch` process attached to a cache repo.
+
+    One fork/exec serves every object lookup against the cache instead of a
+    fresh git invocation per query. Used to probe whether a base commit is
+    already cached (skipping the network fetch entirely) and to read object
+    pre-images when validating diffs.
+    """
+
+    def __init__(self, cache_dir: str):
+        # GIT_NO_LAZY_FETCH keeps lookups purely local on the promisor cache;
+        # a miss should fall through to the explicit depth-1 fetch, not
+        # trigger an unbounded lazy fetch. Older git ignores the variable.
+        self._proc = subprocess.Popen(
+            ["git", "-C", cache_dir, "cat-file", "--batch"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            env={**_GIT_ENV, "GIT_NO_LAZY_FETCH": "1"},
+            bufsize=0,
+        )
+
+    def alive(self) -> bool:
+        return self._proc.poll() is None
+
+    def get(self, ref: str) -> Any:
+        """Return the raw object bytes for ref, or None if not in the cache."""
+        self._proc.stdin.write(ref.encode() + b"\n")
+        self._proc.stdin.flush()
+        header = self._proc.stdout.readline()
+        parts = header.split()
+        if not parts or parts[-1] == b"missing":
+            return None
+        size = int(parts[2])
+        body = self._proc.stdout.read(size + 1)  # content + trailing newline
+        return body[:size]
+
+    def contains(self, ref: str) -> bool:
+        return self.get(ref) is not None
+
+    def close(self) -> None:
+        try:
+            self._proc.stdin.close()
+            self._proc.terminate()
+            self._proc.wait(timeout=5)
+        except Exception:
+            pass
+
+
+_GIT_BATCHES: Dict[str, GitBatch] = {}
+
+
+def _git_batch(cache_dir: str) -> GitBatch:
+    """Lazily create (or revive) the batch process for a cache repo."""
+    gb = _GIT_BATCHES.get(cache_dir)
+    if gb is None or not gb.alive():
+        gb = GitBatch(cache_dir)
+        _GIT_BATCHES[cache_dir] = gb
+    return gb
+
+
+@atexit.register
+def _close_git_batches() -> None:
+    for gb in _GIT_BATCHES.values():
+        gb.close()
+
+
+def _workspace_base() -> str:
+    """Pick the base directory for per-instance workspaces.
+
+    With HAL_AUGGIE_TMPFS=1, use /dev/shm (tmpfs) so the thousands of small
+    files a checkout writes never hit disk - git checkouts are syscall-heavy
+    and RAM-backed workspaces skip page-cache write-back entirely. Falls back
+    to the default temp dir when shm is missing, unwritable, or low on space.
+    """
+    if os.environ.get("HAL_AUGGIE_TMPFS") == "1" and os.path.isdir("/dev/shm") and os.access("/dev/shm", os.W_OK):
+        try:
+            if shutil.disk_usage("/dev/shm").free > 2 * 1024**3:
+                return "/dev/shm"
+        except OSError:
+            pass
+    return tempfile.gettempdir()
+
+
+def _cache_cmd(cache_dir: str, cmd, check=True):
+    return subprocess.run(cmd, cwd=cache_dir, env=_GIT_ENV, text=True, capture_output=True, check=check)
+
+
+def _ensure_repo_cache(repo: str) -> str:
+    """Return the path to the bare cache for `repo`, initializing it on first use."""
+    cache_dir = os.path.join(_REPO_CACHE_DIR, repo.replace("/", "__") + ".git")
+    os.makedirs(cache_dir, exist_ok=True)
+    with open(os.path.join(cache_dir, "hal.lock"), "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        if not os.path.exists(os.path.join(cache_dir, "HEAD")):
+            _cache_cmd(cache_dir, ["git", "init", "--bare", "--quiet"])
+            _cache_cmd(cache_dir, ["git", "remote", "add", "origin", f"https://github.com/{repo}.git"])
+            # Partial clone: only commits/trees are fetched eagerly; blobs are
+            # pulled from GitHub on demand and then kept in the cache, so each
+            # instance only downloads the files it actually touches.
+            _cache_cmd(cache_dir, ["git", "config", "remote.origin.promisor", "true"])
+            _cache_cmd(cache_dir, ["git", "config", "remote.origin.partialclonefilter", "blob:none"])
+            # Let workspace clones lazily fetch arbitrary blobs through the cache
+            _cache_cmd(cache_dir, ["git", "config", "uploadpack.allowFilter", "true"])
+            _cache_cmd(cache_dir, ["git", "config", "uploadpack.allowAnySHA1InWant", "true"])
+    return cache_dir
+
+
+def _fetch_base_commit(cache_dir: str, base_commit: str) -> None:
+    """Fetch base_commit into the cache.
+
+    Concurrent workers fetching the same repo serialize on a per-repo flock so
+    only one fetch runs at a time; workers on different repos don't block each other.
+    """
+    # SWE-bench Lite clusters many instances on the same base commit; the
+    # batch process answers the already-cached case without any network
+    if _git_batch(cache_dir).contains(base_commit):
+        return
+    with open(os.path.join(cache_dir, "hal.lock"), "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        # Protocol v2 trims the ref advertisement when asking for a single
+        # SHA, the noop negotiator skips have/want rounds (we know exactly
+        # what we need), and --no-tags avoids walking tag objects.
+        _cache_cmd(
+            cache_dir,
+            [
+                "git",
+                "-c", "protocol.version=2",
+                "-c", "fetch.negotiationAlgorithm=noop",
+                "fetch", "--depth", "1", "--no-tags", "--filter=blob:none",
+                "origin", base_commit,
+            ],
+        )
+
 
 def run(input_data: Dict[str, Any], **kwargs) -> Dict[str, str]:
     """
@@ -32,25 +190,35 @@ def run(input_data: Dict[str, Any], **kwargs) -> Dict[str, str]:
         model = kwargs.get("model_name") or kwargs.get("model")
 
         # 1) Prepare a temporary git workspace for Auggie
-        workdir = tempfile.mkdtemp(prefix="auggie-swebench-")
-        repo_url = f"https://github.com/{repo}.git"
-
-        git_env = os.environ.copy()
-        # Make git non-interactive and set a default identity (needed for staging)
-        git_env.setdefault("GIT_TERMINAL_PROMPT", "0")
+        workdir = tempfile.mkdtemp(prefix="auggie-swebench-", dir=_workspace_base())
 
         def run_cmd(cmd, cwd=None, check=True):
-            return subprocess.run(cmd, cwd=cwd, env=git_env, text=True, capture_output=True, check=check)
-
-        # Clone and checkout base commit
-        run_cmd(["git", "init"], cwd=workdir)
-        run_cmd(["git", "remote", "add", "origin", repo_url], cwd=workdir)
-        # Shallow fetch of the base commit and checkout
-        run_cmd(["git", "fetch", "--depth", "1", "origin", base_commit], cwd=workdir)
-        run_cmd(["git", "checkout", "FETCH_HEAD"], cwd=workdir)
-        # Set minimal user for staging
-        run_cmd(["git", "config", "user.email", "auggie@example.com"], cwd=workdir)
-        run_cmd(["git", "config", "user.name", "Auggie"], cwd=workdir)
+            return subprocess.run(cmd, cwd=cwd, env=_GIT_ENV, text=True, capture_output=True, check=check)
+
+        # Fetch the base commit into the persistent cache, then create a cheap
+        # workspace that shares the cache's object store (no re-transfer).
+        cache_dir = _ensure_repo_cache(repo)
+        # One bash invocation for the local workspace setup instead of six
+        # subprocess.run calls; fork/exec + git startup adds up per instance.
+        # origin (the cache) is marked promisor so checkout can fault in blobs
+        # that the blob-filtered cache fetch deliberately skipped.
+        setup_script = (
+            "set -e; "
+            f"git clone --quiet --shared --no-checkout {shlex.quote(cache_dir)} .; "
+            "git config remote.origin.promisor true; "
+            "git config remote.origin.partialclonefilter blob:none; "
+            "git config user.email auggie@example.com; "
+            "git config user.name Auggie"
+        )
+        # The setup script is purely local (the clone only needs the cache to
+        # exist, not the base commit), so overlap it with the network fetch
+        # and check out once both have finished.
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            fetch_fut = pool.submit(_fetch_base_commit, cache_dir, base_commit)
+            setup_fut = pool.submit(run_cmd, ["bash", "-ec", setup_script], workdir)
+            fetch_fut.result()
+            setup_fut.result()
+        run_cmd(["git", "checkout", "--quiet", base_commit], cwd=workdir)
 
         # 2) Ask Auggie to apply the fix to the checked-out workspace
         instruction = (
@@ -78,17 +246,30 @@ def run(input_data: Dict[str, Any], **kwargs) -> Dict[str, str]:
         if model:
             cmd += ["--model", str(model)]
         timeout_s = int(kwargs.get("timeout_seconds", 480))
-        try:
-            proc = subprocess.run(cmd, text=True, check=False, timeout=timeout_s)
-        except subprocess.TimeoutExpired:
-            return {instance_id: "ERROR: Auggie timed out"}
-        if proc.returncode != 0:
+        # Drain stdout/stderr straight to files in the workspace: memory stays
+        # constant however verbose Auggie gets, and the monitor can tail the
+        # logs for live status while the instance runs
+        stdout_path = os.path.join(workdir, "auggie_stdout.txt")
+        stderr_path = os.path.join(workdir, "auggie_stderr.txt")
+        with open(stdout_path, "wb") as so, open(stderr_path, "wb") as se:
+            proc = subprocess.Popen(cmd, stdout=so, stderr=se)
+            try:
+                rc = proc.wait(timeout=timeout_s)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+                proc.wait()
+                return {instance_id: "ERROR: Auggie timed out"}
+        if rc != 0:
             return {instance_id: "ERROR: Auggie failed (non-zero exit)"}
 
         # 3) Produce a unified diff of changes
-        # Stage all changes (include new/deleted files), then diff from index
-        run_cmd(["git", "add", "-A"], cwd=workdir)
-        diff = run_cmd(["git", "diff", "--cached"], cwd=workdir, check=False).stdout
+        # Intent-to-add (-N) makes new files visible to diff without hashing
+        # and writing their blobs into the object DB the way `add -A` would
+        diff = run_cmd(
+            ["bash", "-ec", "git add -N . && git -c core.quotepath=off diff --binary --no-renames HEAD"],
+            cwd=workdir,
+            check=False,
+        ).stdout
         diff = (diff or "").strip()
         if not diff:
             return {instance_id: "ERROR: No changes detected (empty diff)"}
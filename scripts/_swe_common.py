@@ -0,0 +1,48 @@
+"""Shared helpers for the SWE-bench summary scripts.
+
+Used by summarize_swe_run.py and view_swebench_results.py so both walk the
+logs/run_evaluation tree and parse per-instance report.json files the same
+way (one os.scandir pass, orjson when available).
+"""
+
+import json
+import os
+from typing import Any, Iterator, Optional
+
+try:
+    import orjson  # type: ignore
+
+    def _loads(raw: bytes) -> Any:
+        return orjson.loads(raw)
+except ImportError:
+    def _loads(raw: bytes) -> Any:
+        return json.loads(raw)
+
+
+def load_report(fp: str) -> Optional[Any]:
+    """Read and parse one report.json; returns None on read/parse failure."""
+    try:
+        with open(fp, "rb") as f:
+            return _loads(f.read())
+    except Exception:
+        return None
+
+
+def iter_report_paths(base: str) -> Iterator[str]:
+    """Yield report.json paths under base via os.scandir.
+
+    Cheaper than glob's recursive walk (no fnmatch, no intermediate list)
+    and streams paths so downstream work can start immediately.
+    """
+    stack = [base]
+    while stack:
+        d = stack.pop()
+        try:
+            with os.scandir(d) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.name == "report.json":
+                        yield entry.path
+        except OSError:
+            continue
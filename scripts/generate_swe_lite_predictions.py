@@ -1,10 +1,22 @@
 #!/usr/bin/env python3
 import argparse
+import atexit
 import json
 import os
+import signal
 import sys
 import time
-from typing import Dict, Any
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, Any, Set
+
+try:
+    import orjson  # type: ignore
+
+    def _dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj)
+except ImportError:
+    def _dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode()
 
 # Ensure repo root on path for module imports
 REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -20,6 +32,25 @@ def flush(msg: str):
     print(f"[{ts}] {msg}", flush=True)
 
 
+def load_completed_ids(out_path: str) -> Set[str]:
+    """Scan an existing predictions JSONL for instance_ids already written."""
+    done: Set[str] = set()
+    if not os.path.isfile(out_path):
+        return done
+    with open(out_path, "r") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                iid = json.loads(line).get("instance_id")
+            except Exception:
+                continue
+            if iid:
+                done.add(iid)
+    return done
+
+
 def main():
     parser = argparse.ArgumentParser(description="Generate SWE-bench Lite predictions with Auggie")
     parser.add_argument("--model", "--model_name", dest="model", default="sonnet4", help="Auggie model name (e.g., sonnet4)")
@@ -27,6 +58,8 @@ def main():
     parser.add_argument("--max_tasks", type=int, default=0, help="Limit number of tasks (0 = all)")
     parser.add_argument("--start_index", type=int, default=0, help="Start from this index in the dataset")
     parser.add_argument("--timeout_seconds", type=int, default=480, help="Per-task Auggie timeout in seconds")
+    parser.add_argument("--workers", type=int, default=4, help="Number of parallel Auggie workers")
+    parser.add_argument("--resume", action="store_true", help="Append to --out, skipping instance_ids already written")
 
     args = parser.parse_args()
 
@@ -36,58 +69,103 @@ def main():
 
     flush("Loading SWE-bench Lite dataset (test split)...")
     ds = load_dataset("princeton-nlp/SWE-bench_Lite", split="test")
+    # Project to the five fields we read; skips mmapping the patch/test
+    # columns and keeps RSS down for the pool workers
+    ds = ds.select_columns(
+        ["instance_id", "problem_statement", "repo", "base_commit", "environment_setup_commit"]
+    )
 
     total = len(ds)
     start = max(0, args.start_index)
     end = total if args.max_tasks in (None, 0) else min(total, start + args.max_tasks)
     flush(f"Dataset size: {total}. Processing indices [{start}:{end}) ...")
 
-    # Open output file
-    written = 0
-    with open(args.out, "w") as f:
-        for idx in range(start, end):
-            rec: Dict[str, Any] = ds[idx]
-            instance_id = rec.get("instance_id")
-            problem_statement = (rec.get("problem_statement") or rec.get("problem_statement_str") or "").strip()
-            repo = (rec.get("repo") or rec.get("repo_full_name") or "").strip()
-            base_commit = (rec.get("base_commit") or "").strip()
-            env_setup_commit = (rec.get("environment_setup_commit") or "").strip()
-
-            if not instance_id:
-                flush(f"Skipping index {idx}: missing instance_id")
-                continue
-
-            input_data = {
-                instance_id: {
-                    "problem_statement": problem_statement,
-                    "repo": repo,
-                    "base_commit": base_commit,
-                    "environment_setup_commit": env_setup_commit,
-                }
+    completed: Set[str] = set()
+    if args.resume:
+        completed = load_completed_ids(args.out)
+        if completed:
+            flush(f"Resuming: {len(completed)} predictions already in {args.out}")
+
+    # Build the work list up front; each instance is fully independent
+    # (own temp workdir, own Auggie subprocess), so they can run in parallel.
+    # Cluster instances that share (repo, base_commit) so back-to-back tasks
+    # hit the agent's repo cache with the commit already fetched - only the
+    # first instance of a cluster pays the network cost.
+    indices = sorted(range(start, end), key=lambda i: (ds[i]["repo"] or "", ds[i]["base_commit"] or ""))
+    tasks = []
+    for idx in indices:
+        rec: Dict[str, Any] = ds[idx]
+        instance_id = rec.get("instance_id")
+        problem_statement = (rec.get("problem_statement") or "").strip()
+        repo = (rec.get("repo") or "").strip()
+        base_commit = (rec.get("base_commit") or "").strip()
+        env_setup_commit = (rec.get("environment_setup_commit") or "").strip()
+
+        if not instance_id:
+            flush(f"Skipping index {idx}: missing instance_id")
+            continue
+        if instance_id in completed:
+            continue
+
+        input_data = {
+            instance_id: {
+                "problem_statement": problem_statement,
+                "repo": repo,
+                "base_commit": base_commit,
+                "environment_setup_commit": env_setup_commit,
             }
+        }
+        tasks.append((instance_id, input_data))
 
-            flush(f"[{written+1}] Running Auggie on {instance_id} ({repo}@{base_commit[:7]}) ...")
-            try:
-                result_map = auggie_run(input_data, model_name=args.model, timeout_seconds=args.timeout_seconds)
-            except Exception as e:
-                flush(f"ERROR running Auggie for {instance_id}: {e}")
-                result_map = {instance_id: f"ERROR: {e}"}
-
-            # If the agent created local logs in its temp workdir, copy them alongside results for tailing
-            # The agent writes auggie_stdout.txt/auggie_stderr.txt inside its temp workspace, but it cleans up after.
-            # So live streaming happens via stdout; here we do nothing extra.
+    flush(f"Dispatching {len(tasks)} tasks across {args.workers} workers ...")
 
-            model_patch = result_map.get(instance_id, "ERROR: No output from Auggie")
+    # Processes rather than threads: auggie_run spawns subprocesses and
+    # mutates its copy of the environment. Results are written as futures
+    # complete; as_completed serializes writes in the main thread.
+    written = 0
+    # Binary writes with a large buffer and no per-line flush; the buffer is
+    # flushed at exit (or on SIGTERM/SIGINT) so the tail survives a kill
+    with open(args.out, "ab" if args.resume else "wb", buffering=1 << 20) as f:
 
-            out_obj = {
-                "instance_id": instance_id,
-                "model_patch": model_patch,
-                "model_name_or_path": f"Auggie({args.model})",
+        def _flush_output():
+            try:
+                if not f.closed:
+                    f.flush()
+            except Exception:
+                pass
+
+        def _on_signal(signum, frame):
+            _flush_output()
+            raise SystemExit(128 + signum)
+
+        atexit.register(_flush_output)
+        signal.signal(signal.SIGTERM, _on_signal)
+        signal.signal(signal.SIGINT, _on_signal)
+
+        with ProcessPoolExecutor(max_workers=args.workers) as ex:
+            futures = {
+                ex.submit(auggie_run, input_data, model_name=args.model, timeout_seconds=args.timeout_seconds): instance_id
+                for instance_id, input_data in tasks
             }
-            f.write(json.dumps(out_obj) + "\n")
-            f.flush()
-            written += 1
-            flush(f"[{written}] Wrote prediction for {instance_id}")
+            for fut in as_completed(futures):
+                instance_id = futures[fut]
+                try:
+                    result_map = fut.result()
+                except Exception as e:
+                    flush(f"ERROR running Auggie for {instance_id}: {e}")
+                    result_map = {instance_id: f"ERROR: {e}"}
+
+                model_patch = result_map.get(instance_id, "ERROR: No output from Auggie")
+
+                out_obj = {
+                    "instance_id": instance_id,
+                    "model_patch": model_patch,
+                    "model_name_or_path": f"Auggie({args.model})",
+                }
+                f.write(_dumps(out_obj))
+                f.write(b"\n")
+                written += 1
+                flush(f"[{written}/{len(tasks)}] Wrote prediction for {instance_id}")
 
     flush(f"Done. Wrote {written} predictions to {args.out}")
 
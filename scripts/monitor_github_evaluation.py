@@ -9,37 +9,79 @@ import json
 import sys
 from datetime import datetime
 
-def get_workflow_runs(repo_owner, repo_name, token=None):
-    """Get recent workflow runs for the repository"""
-    url = f"https://api.github.com/repos/{repo_owner}/{repo_name}/actions/runs"
-    headers = {}
-    if token:
-        headers['Authorization'] = f'token {token}'
-    
-    response = requests.get(url, headers=headers)
+def get_workflow_runs(repo_owner, repo_name, token=None, session=None, etag=None, workflow_file=None):
+    """Get recent workflow runs for the repository.
+
+    When workflow_file is given (e.g. "swe-bench-evaluation.yml"), GitHub
+    filters to that workflow server-side and only a handful of runs come
+    back, instead of the default 30-run page we'd otherwise filter in
+    Python. Sends If-None-Match with the previous ETag so GitHub can answer
+    304 Not Modified - those responses are near-empty and don't count
+    against the API rate limit.
+
+    Returns (status_code, etag, runs_json_or_None).
+    """
+    if workflow_file:
+        url = f"https://api.github.com/repos/{repo_owner}/{repo_name}/actions/workflows/{workflow_file}/runs?per_page=5"
+    else:
+        url = f"https://api.github.com/repos/{repo_owner}/{repo_name}/actions/runs?per_page=5"
+    # Only the conditional header varies per call; auth/accept headers live
+    # on the session when one is provided
+    headers = {'If-None-Match': etag} if etag else {}
+    if session is None:
+        headers['Accept'] = 'application/vnd.github+json'
+        headers['X-GitHub-Api-Version'] = '2022-11-28'
+        if token:
+            headers['Authorization'] = f'token {token}'
+
+    http = session or requests
+    response = http.get(url, headers=headers)
     if response.status_code == 200:
-        return response.json()
+        return 200, response.headers.get('ETag'), response.json()
+    elif response.status_code == 304:
+        return 304, etag, None
     else:
         print(f"Error fetching workflow runs: {response.status_code}")
-        return None
+        return response.status_code, etag, None
 
-def monitor_evaluation(repo_owner, repo_name, workflow_name="SWE-bench Evaluation", token=None):
+def monitor_evaluation(repo_owner, repo_name, workflow_name="SWE-bench Evaluation",
+                       workflow_file="swe-bench-evaluation.yml", token=None):
     """Monitor the SWE-bench evaluation workflow"""
     print(f"Monitoring {workflow_name} in {repo_owner}/{repo_name}")
     print("=" * 60)
-    
+
+    # One session keeps the TCP/TLS connection alive across polls and the
+    # artifacts call; static headers are set once here
+    session = requests.Session()
+    session.headers.update({
+        'Accept': 'application/vnd.github+json',
+        'X-GitHub-Api-Version': '2022-11-28',
+    })
+    if token:
+        session.headers['Authorization'] = f'token {token}'
+    last_etag = None
+
     while True:
-        runs_data = get_workflow_runs(repo_owner, repo_name, token)
+        status, last_etag, runs_data = get_workflow_runs(
+            repo_owner, repo_name, token, session=session, etag=last_etag,
+            workflow_file=workflow_file
+        )
+        if status == 304:
+            # Nothing changed since the last poll; skip the reprint
+            time.sleep(30)
+            continue
         if not runs_data:
             time.sleep(30)
             continue
-        
-        # Find the most recent SWE-bench evaluation run
-        swe_bench_runs = [
-            run for run in runs_data['workflow_runs'] 
-            if workflow_name.lower() in run['name'].lower()
-        ]
-        
+
+        # Server-side filtered when workflow_file is set; otherwise match on name
+        swe_bench_runs = runs_data['workflow_runs']
+        if not workflow_file:
+            swe_bench_runs = [
+                run for run in swe_bench_runs
+                if workflow_name.lower() in run['name'].lower()
+            ]
+
         if not swe_bench_runs:
             print("No SWE-bench evaluation runs found")
             time.sleep(30)
@@ -57,13 +99,9 @@ def monitor_evaluation(repo_owner, repo_name, workflow_name="SWE-bench Evaluatio
         if latest_run['status'] == 'completed':
             print(f"\n🎉 Evaluation completed with conclusion: {latest_run['conclusion']}")
             
-            # Get artifacts
+            # Get artifacts over the same session
             artifacts_url = f"https://api.github.com/repos/{repo_owner}/{repo_name}/actions/runs/{latest_run['id']}/artifacts"
-            headers = {}
-            if token:
-                headers['Authorization'] = f'token {token}'
-            
-            artifacts_response = requests.get(artifacts_url, headers=headers)
+            artifacts_response = session.get(artifacts_url)
             if artifacts_response.status_code == 200:
                 artifacts = artifacts_response.json()
                 print(f"\n📁 Available artifacts ({artifacts['total_count']}):")
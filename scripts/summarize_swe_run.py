@@ -16,38 +16,55 @@ Usage examples:
   python3 scripts/summarize_swe_run.py --all
 
 Optional:
-  --json  Print the summary JSON for the run (when using --run_id)
+  --json  Print the summary JSON for the run (when using --run_id);
+          ID lists are samples capped at 2*top, with full counts alongside
   --top N Show up to N IDs for each of resolved/failed/unknown (default 10)
 
 This script performs only local file reads (no Docker, no network operations).
 """
 
 import argparse
-import glob
+import itertools
 import json
 import os
-from typing import Any, Dict, List, Tuple
+import sys
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Tuple
 
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-def find_report_files_for_run(run_id: str) -> List[str]:
+from _swe_common import iter_report_paths, load_report as _load_report  # noqa: E402
+
+
+def find_report_files_for_run(run_id: str) -> Iterator[str]:
     base = os.path.join("logs", "run_evaluation", run_id)
     if not os.path.isdir(base):
-        return []
-    return glob.glob(os.path.join(base, "**", "report.json"), recursive=True)
+        return iter(())
+    return iter_report_paths(base)
 
 
-def summarize_from_reports(report_files: List[str]) -> Dict[str, Any]:
+def summarize_from_reports(report_files: Iterable[str], top: int = 10) -> Dict[str, Any]:
+    total = 0
     resolved = 0
     failed = 0
     unknown = 0
-    resolved_ids: List[str] = []
-    failed_ids: List[str] = []
-    unknown_ids: List[str] = []
-
-    for fp in report_files:
-        try:
-            with open(fp, "r") as f:
-                data = json.load(f)
+    # Full counts are kept; IDs are sampled into bounded buffers so memory
+    # stays O(top) on multi-thousand-instance runs and --json output stays small
+    resolved_ids: Deque[str] = deque(maxlen=top * 2)
+    failed_ids: Deque[str] = deque(maxlen=top * 2)
+    unknown_ids: Deque[str] = deque(maxlen=top * 2)
+
+    # Reading dominates here (many small files, often on slow/network disks),
+    # so fan reads out across threads; parsing stays in the main thread.
+    report_files, paths_for_load = itertools.tee(report_files)
+    with ThreadPoolExecutor(max_workers=32) as ex:
+        for fp, data in zip(report_files, ex.map(_load_report, paths_for_load)):
+            total += 1
+            if data is None:
+                unknown += 1
+                unknown_ids.append(f"<error:{os.path.basename(fp)}>")
+                continue
             # Expect a dict with a single key = instance_id
             if not isinstance(data, dict) or not data:
                 unknown += 1
@@ -66,18 +83,17 @@ def summarize_from_reports(report_files: List[str]) -> Dict[str, Any]:
             else:
                 unknown += 1
                 unknown_ids.append(instance_id)
-        except Exception:
-            unknown += 1
-            unknown_ids.append(f"<error:{os.path.basename(fp)}>")
 
     summary = {
-        "total_instances": len(report_files),
+        "total_instances": total,
         "resolved_instances": resolved,
         "unresolved_instances": failed,
         "unknown_instances": unknown,
-        "resolved_ids": resolved_ids,
-        "unresolved_ids": failed_ids,
-        "error_ids": unknown_ids,
+        # Samples, not full lists - see the bounded buffers above
+        "resolved_ids_sample": list(resolved_ids),
+        "unresolved_ids_sample": list(failed_ids),
+        "error_ids_sample": list(unknown_ids),
+        "ids_sample_limit": top * 2,
     }
     return summary
 
@@ -97,21 +113,20 @@ def print_human_summary(run_id: str, summary: Dict[str, Any], top: int) -> None:
     print(f"Unknown/Error:     {unknown}")
     print(f"Accuracy:          {acc:.2%}")
 
-    def _print_section(title: str, ids: List[str]):
-        print(f"\n{title} ({len(ids)}):")
+    def _print_section(title: str, count: int, ids: List[str]):
+        print(f"\n{title} ({count}):")
         for iid in ids[:top]:
             print(f"  - {iid}")
-        if len(ids) > top:
-            print(f"  ... (+{len(ids) - top} more)")
+        if count > top:
+            print(f"  ... (+{count - top} more)")
 
-    _print_section("Resolved IDs", list(summary.get("resolved_ids", [])))
-    _print_section("Unresolved IDs", list(summary.get("unresolved_ids", [])))
-    _print_section("Unknown/Error IDs", list(summary.get("error_ids", [])))
+    _print_section("Resolved IDs", resolved, list(summary.get("resolved_ids_sample", [])))
+    _print_section("Unresolved IDs", unresolved, list(summary.get("unresolved_ids_sample", [])))
+    _print_section("Unknown/Error IDs", unknown, list(summary.get("error_ids_sample", [])))
 
 
-def summarize_run(run_id: str) -> Tuple[Dict[str, Any], List[str]]:
-    files = find_report_files_for_run(run_id)
-    return summarize_from_reports(files), files
+def summarize_run(run_id: str, top: int = 10) -> Dict[str, Any]:
+    return summarize_from_reports(find_report_files_for_run(run_id), top=top)
 
 
 def list_runs_under_logs() -> List[str]:
@@ -136,7 +151,7 @@ def main() -> None:
             return
         rows: List[Tuple[str, int, int, int, int]] = []
         for run_id in runs:
-            summary, _ = summarize_run(run_id)
+            summary = summarize_run(run_id)
             rows.append(
                 (
                     run_id,
@@ -156,8 +171,8 @@ def main() -> None:
         print("Please specify --run_id or use --all to summarize all runs.")
         return
 
-    summary, files = summarize_run(args.run_id)
-    if not files:
+    summary = summarize_run(args.run_id, top=args.top)
+    if not summary.get("total_instances"):
         print(f"No report.json files found for run_id={args.run_id} under logs/run_evaluation/{args.run_id}")
         return
 
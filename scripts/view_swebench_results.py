@@ -1,17 +1,26 @@
 #!/usr/bin/env python3
 import argparse
+import functools
 import json
 import os
 import sys
-import glob
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, List, Tuple, Set
 
 REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
+from _swe_common import iter_report_paths, load_report as _load_report  # noqa: E402
+
+
+@functools.lru_cache(maxsize=None)
 def load_final_report(run_id: str, explicit_path: str | None) -> Tuple[Dict[str, Any] | None, str | None]:
     """Try to load the final evaluation report JSON for a run.
     Returns (report_dict, path_used) or (None, None) if not found.
+
+    Cached per (run_id, path) so repeat lookups in the same process don't
+    rescan the repo root or re-read the report.
     """
     candidates: List[str] = []
 
@@ -21,8 +30,15 @@ def load_final_report(run_id: str, explicit_path: str | None) -> Tuple[Dict[str,
     # results/<run_id>/evaluation.json (our runner's canonical location)
     candidates.append(os.path.join(REPO_ROOT, "results", run_id, "evaluation.json"))
 
-    # <model>.<run_id>.json in repo root (harness default)
-    candidates.extend(glob.glob(os.path.join(REPO_ROOT, f"*.{run_id}.json")))
+    # <model>.<run_id>.json in repo root (harness default); one scandir pass
+    # with an endswith check beats glob compiling and matching a pattern
+    suffix = f".{run_id}.json"
+    try:
+        candidates.extend(
+            e.path for e in os.scandir(REPO_ROOT) if e.name.endswith(suffix) and e.is_file()
+        )
+    except OSError:
+        pass
 
     for path in candidates:
         if path and os.path.isfile(path):
@@ -54,36 +70,37 @@ def aggregate_from_reports(run_id: str) -> Tuple[Dict[str, Any] | None, str | No
         return None, None
 
     # Find all report.json files under run_id/*/*/report.json
-    report_files = glob.glob(os.path.join(base, "**", "report.json"), recursive=True)
-    if not report_files:
-        return None, base
+    report_files = iter_report_paths(base)
 
     resolved_ids: Set[str] = set()
     unresolved_ids: Set[str] = set()
     error_ids: Set[str] = set()
 
-    for report_path in report_files:
-        try:
-            with open(report_path, "r") as f:
-                per = json.load(f)
-            # per is {instance_id: {...}} per harness
-            if not isinstance(per, dict) or not per:
-                continue
-            (iid, data), = per.items()
-            resolved = bool(data.get("resolved"))
-            if resolved:
-                resolved_ids.add(iid)
-            else:
-                # Treat missing or False resolved as unresolved, unless error present
-                if data.get("error") or data.get("exception"):
+    # Threaded reads: the work is open/read syscalls on many small files.
+    # Each instance lands in exactly one bucket, so no post-hoc set
+    # subtraction is needed to avoid double-counting.
+    seen = 0
+    with ThreadPoolExecutor(max_workers=32) as ex:
+        for per in ex.map(_load_report, report_files):
+            seen += 1
+            try:
+                # per is {instance_id: {...}} per harness
+                if per is None or not isinstance(per, dict) or not per:
+                    continue
+                (iid, data), = per.items()
+                has_error = bool(data.get("error") or data.get("exception"))
+                if data.get("resolved"):
+                    resolved_ids.add(iid)
+                elif has_error:
                     error_ids.add(iid)
                 else:
+                    # Missing or False resolved without an error counts as unresolved
                     unresolved_ids.add(iid)
-        except Exception:
-            continue
+            except Exception:
+                continue
 
-    # Avoid double-counting: remove errors from unresolved
-    unresolved_ids -= error_ids
+    if not seen:
+        return None, base
 
     summary = {
         "resolved_instances": len(resolved_ids),